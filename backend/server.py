@@ -5901,8 +5901,11 @@ async def update_activity(date: str, activity_data: ActivityCreate, current_user
     return {"message": "Activity updated"}
 
 @api_router.get("/activities/my")
-async def get_my_activities(current_user: dict = Depends(get_current_user)):
-    activities = await db.activities.find({"user_id": current_user['id']}, {"_id": 0}).sort("date", -1).to_list(1000)
+async def get_my_activities(current_user: dict = Depends(get_current_user), date: str = None):
+    query = {"user_id": current_user['id']}
+    if date:
+        query["date"] = date
+    activities = await db.activities.find(query, {"_id": 0}).sort("date", -1).to_list(1000)
     return activities
 
 # Manager editing team member activities
@@ -14,6 +14,9 @@ from pytz import timezone as pytz_timezone
 # Configuration
 BACKEND_URL = "https://interviewplus.preview.emergentagent.com/api"
 
+# Set TEST_VERBOSE=0 to mute info/success output
+VERBOSE = os.environ.get('TEST_VERBOSE', '1') not in ('', '0')
+
 class Colors:
     GREEN = '\033[92m'
     RED = '\033[91m'
@@ -23,7 +26,8 @@ class Colors:
     BOLD = '\033[1m'
 
 def print_success(message):
-    print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
+    if VERBOSE:
+        print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
 
 def print_error(message):
     print(f"{Colors.RED}❌ {message}{Colors.ENDC}")
@@ -32,7 +36,8 @@ def print_warning(message):
     print(f"{Colors.YELLOW}⚠️  {message}{Colors.ENDC}")
 
 def print_info(message):
-    print(f"{Colors.BLUE}ℹ️  {message}{Colors.ENDC}")
+    if VERBOSE:
+        print(f"{Colors.BLUE}ℹ️  {message}{Colors.ENDC}")
 
 def print_header(message):
     print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
@@ -65,10 +70,30 @@ class ComprehensiveDateTester:
             print_error(f"Login exception: {str(e)}")
             return False
 
+    def token_is_valid(self, token):
+        """Check a supplied token against /auth/me before reusing it"""
+        try:
+            response = self.session.get(
+                f"{BACKEND_URL}/auth/me",
+                headers={"Authorization": f"Bearer {token}"}
+            )
+        except Exception as e:
+            print_warning(f"Could not check supplied token: {str(e)}")
+            return False
+        
+        if response.status_code == 401:
+            print_warning("Supplied token was rejected (401), logging in instead")
+            return False
+        return True
+
     def analyze_date_context(self):
         """Analyze the date context to understand the user's issue"""
         print_header("DATE CONTEXT ANALYSIS")
         
+        # Everything below is informational output only
+        if not VERBOSE:
+            return
+        
         # System date analysis
         print_info("🖥️  SYSTEM DATE ANALYSIS:")
         system_now = datetime.now()
@@ -149,7 +174,7 @@ class ComprehensiveDateTester:
                     date_str = date_info.get('date', '')
                     is_today = date_info.get('is_today', False)
                     
-                    print_info(f"   {day_name}: {date_str} {'(TODAY)' if is_today else ''}")
+                    print_info("   %s: %s %s" % (day_name, date_str, "(TODAY)" if is_today else ""))
                     
                     if day_name == 'Wednesday':
                         wednesday_date = date_str
@@ -269,18 +294,16 @@ class ComprehensiveDateTester:
                 if daily_response.status_code == 200:
                     daily_data = daily_response.json()
                     
-                    # Check if our test activity appears
+                    # Index members by (contacts, premium) so each lookup is O(1)
                     data_array = daily_data.get('data', [])
-                    found_activity = False
-                    
-                    for member in data_array:
-                        if (member.get('contacts', 0) == expected_contacts and 
-                            member.get('premium', 0) == expected_premium):
-                            found_activity = True
-                            print_success(f"✅ Found {label} in daily report")
-                            break
-                    
-                    if not found_activity:
+                    by_key = {
+                        (member.get('contacts', 0), member.get('premium', 0)): member
+                        for member in data_array
+                    }
+
+                    if by_key.get((expected_contacts, expected_premium)) is not None:
+                        print_success(f"✅ Found {label} in daily report")
+                    else:
                         print_warning(f"⚠️  {label} not found in daily report")
                         
                 else:
@@ -289,13 +312,16 @@ class ComprehensiveDateTester:
         except Exception as e:
             print_error(f"Exception in activity placement test: {str(e)}")
 
-    def run_comprehensive_test(self):
-        """Run comprehensive date investigation"""
+    def run_comprehensive_test(self, token=None):
+        """Run comprehensive date investigation, reusing token if one is supplied"""
         print_header("🔍 COMPREHENSIVE DATE INVESTIGATION")
         print_info("Understanding the Wednesday date confusion issue")
         
         # Login
-        if not self.login_user():
+        if token and self.token_is_valid(token):
+            self.token = token
+            print_info("Using supplied authentication token")
+        elif not self.login_user():
             print_error("Failed to login")
             return False
         
@@ -320,4 +346,4 @@ class ComprehensiveDateTester:
 
 if __name__ == "__main__":
     tester = ComprehensiveDateTester()
-    tester.run_comprehensive_test()
\ No newline at end of file
+    tester.run_comprehensive_test(token=os.environ.get('CRM_AUTH_TOKEN'))
\ No newline at end of file
@@ -14,15 +14,25 @@ CRITICAL TESTS:
 3. Check the week calculation math
 """
 
-import requests
 import json
-from datetime import datetime, timedelta
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import cached_property, lru_cache
 import sys
 import os
-from pytz import timezone as pytz_timezone
+import time
+from zoneinfo import ZoneInfo
 
 # Configuration
 BACKEND_URL = "https://interviewplus.preview.emergentagent.com/api"
+MAX_WORKERS = 8
+CENTRAL_TZ = ZoneInfo('America/Chicago')
+WEEK_DATES_TTL = 60  # seconds
+
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+WEEKDAY_INDEX = {name: i for i, name in enumerate(WEEKDAY_NAMES)}
+DAY_OFFSETS = tuple(timedelta(days=i) for i in range(7))
 
 class Colors:
     GREEN = '\033[92m'
@@ -32,33 +42,64 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Prebuilt color prefixes/suffix so each helper is a single write
+_SUCCESS_PFX = f"{Colors.GREEN}✅ "
+_ERROR_PFX = f"{Colors.RED}❌ "
+_WARNING_PFX = f"{Colors.YELLOW}⚠️  "
+_INFO_PFX = f"{Colors.BLUE}ℹ️  "
+_HEADER_PFX = f"{Colors.BOLD}{Colors.BLUE}"
+_HEADER_RULE = f"{_HEADER_PFX}{'='*80}{Colors.ENDC}\n"
+_RESET = f"{Colors.ENDC}\n"
+
 def print_success(message):
-    print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
+    sys.stdout.write(_SUCCESS_PFX + str(message) + _RESET)
 
 def print_error(message):
-    print(f"{Colors.RED}❌ {message}{Colors.ENDC}")
+    sys.stdout.write(_ERROR_PFX + str(message) + _RESET)
 
 def print_warning(message):
-    print(f"{Colors.YELLOW}⚠️  {message}{Colors.ENDC}")
+    sys.stdout.write(_WARNING_PFX + str(message) + _RESET)
 
 def print_info(message):
-    print(f"{Colors.BLUE}ℹ️  {message}{Colors.ENDC}")
+    sys.stdout.write(_INFO_PFX + str(message) + _RESET)
 
 def print_header(message):
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{message}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
+    sys.stdout.write("\n" + _HEADER_RULE + _HEADER_PFX + str(message) + _RESET + _HEADER_RULE)
+
+@lru_cache(maxsize=1)
+def _central_now_for_minute(minute_key):
+    return datetime.now(timezone.utc).astimezone(CENTRAL_TZ)
+
+def _now_central():
+    """Current Central time, memoized per minute (enough to identify the date)"""
+    return _central_now_for_minute(int(time.time() // 60))
+
+def _today_central():
+    return _now_central().date()
 
 class DateCalculationDebugger:
     def __init__(self):
-        self.session = requests.Session()
         self.token = None
+        self._week_dates_cache = None
+        self._week_dates_ts = 0
+        self._weekday_to_date = {}
         self.test_results = {
             'passed': 0,
             'failed': 0,
             'critical_issues': []
         }
 
+    @cached_property
+    def session(self):
+        """HTTP session, created on first use so local-only tests never import requests"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        # Size the pool so concurrent probes reuse connections
+        session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+        return session
+
     def login_user(self):
         """Login with existing state manager"""
         print_header("AUTHENTICATION")
@@ -82,6 +123,22 @@ class DateCalculationDebugger:
             print_error(f"Login exception: {str(e)}")
             return False
 
+    def _get_week_dates(self, headers):
+        """Fetch /team/week-dates, reusing a recent response if one is cached"""
+        if self._week_dates_cache is not None and time.time() - self._week_dates_ts < WEEK_DATES_TTL:
+            return self._week_dates_cache
+        
+        response = self.session.get(f"{BACKEND_URL}/team/week-dates", headers=headers)
+        if response.status_code != 200:
+            print_error(f"Week dates endpoint failed: {response.status_code} - {response.text}")
+            return None
+        
+        data = response.json()
+        self._week_dates_cache = data
+        self._week_dates_ts = time.time()
+        self._weekday_to_date = {d['day_name']: d['date'] for d in data.get('week_dates', [])}
+        return data
+
     def test_system_date_calculation(self):
         """Test what the system thinks today's date is"""
         print_header("SYSTEM DATE CALCULATION TEST")
@@ -95,10 +152,9 @@ class DateCalculationDebugger:
         try:
             # Test GET /api/team/week-dates
             print_info("Testing GET /api/team/week-dates...")
-            response = self.session.get(f"{BACKEND_URL}/team/week-dates", headers=headers)
+            data = self._get_week_dates(headers)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 print_success("Week dates endpoint accessible")
                 
                 # Extract key information
@@ -109,21 +165,17 @@ class DateCalculationDebugger:
                 print_info(f"🗓️  System thinks TODAY is: {today_from_api}")
                 print_info(f"📅 Week start (Monday): {week_start}")
                 
-                # Find today and Wednesday
+                # Find today
                 today_info = None
-                wednesday_info = None
                 
                 for date_info in week_dates:
-                    day_name = date_info.get('day_name', '')
-                    date_str = date_info.get('date', '')
+                    day_name, date_str = date_info['day_name'], date_info['date']
                     is_today = date_info.get('is_today', False)
                     
                     print_info(f"   {day_name}: {date_str} {'(TODAY)' if is_today else ''}")
                     
                     if is_today:
                         today_info = date_info
-                    if day_name == 'Wednesday':
-                        wednesday_info = date_info
                 
                 # CRITICAL ANALYSIS
                 print_header("CRITICAL DATE ANALYSIS")
@@ -151,8 +203,8 @@ class DateCalculationDebugger:
                     else:
                         print_info(f"ℹ️  Today is {today_day}, not Wednesday")
                 
-                if wednesday_info:
-                    wed_date = wednesday_info.get('date', '')
+                wed_date = self._weekday_to_date.get('Wednesday')
+                if wed_date:
                     print_info(f"📅 Wednesday date in system: {wed_date}")
                     
                     # Check Wednesday date specifically
@@ -170,35 +222,33 @@ class DateCalculationDebugger:
                 print_header("EXPECTED DATE CALCULATION")
                 
                 # Use Central Time like the backend
-                central_tz = pytz_timezone('America/Chicago')
-                now_central = datetime.now(central_tz)
-                today_central = now_central.date()
+                now_central = _now_central()
+                today_central = _today_central()
                 
                 print_info(f"🕐 Current Central Time: {now_central}")
                 print_info(f"📅 Today in Central Time: {today_central}")
                 print_info(f"📊 Today's weekday (0=Monday): {today_central.weekday()}")
                 
-                # Calculate Monday of current week
+                # Calculate Monday of current week on a plain date (no tz arithmetic)
                 monday_central = today_central - timedelta(days=today_central.weekday())
                 
                 # Calculate all days of the week
-                expected_dates = {}
-                days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+                expected_dates = {
+                    day: (monday_central + DAY_OFFSETS[i]).isoformat()
+                    for i, day in enumerate(WEEKDAY_NAMES)
+                }
                 
                 print_info("🗓️  Expected week dates:")
-                for i, day in enumerate(days):
-                    expected_date = monday_central + timedelta(days=i)
-                    expected_dates[day] = expected_date.isoformat()
-                    is_today_marker = " (TODAY)" if expected_date == today_central else ""
-                    print_info(f"   {day}: {expected_date.isoformat()}{is_today_marker}")
+                today_iso = today_central.isoformat()
+                for day, expected_date in expected_dates.items():
+                    is_today_marker = " (TODAY)" if expected_date == today_iso else ""
+                    print_info(f"   {day}: {expected_date}{is_today_marker}")
                 
                 # Compare with API results
                 print_header("API vs EXPECTED COMPARISON")
                 
                 discrepancies = []
-                for date_info in week_dates:
-                    day_name = date_info.get('day_name', '')
-                    api_date = date_info.get('date', '')
+                for day_name, api_date in self._weekday_to_date.items():
                     expected_date = expected_dates.get(day_name, '')
                     
                     if api_date == expected_date:
@@ -218,7 +268,6 @@ class DateCalculationDebugger:
                         print_error(f"   {disc}")
                 
             else:
-                print_error(f"Week dates endpoint failed: {response.status_code} - {response.text}")
                 self.test_results['failed'] += 1
                 
         except Exception as e:
@@ -244,7 +293,8 @@ class DateCalculationDebugger:
             
             print_info("Creating test activities with distinctive signatures...")
             
-            for date_str, label, contacts, appointments, premium in test_activities:
+            def put_activity(activity):
+                date_str, label, contacts, appointments, premium = activity
                 activity_data = {
                     "date": date_str,
                     "contacts": contacts,
@@ -257,12 +307,24 @@ class DateCalculationDebugger:
                     "premium": premium
                 }
                 
-                response = self.session.put(
+                return self.session.put(
                     f"{BACKEND_URL}/activities/{date_str}",
                     json=activity_data,
                     headers=headers
                 )
-                
+            
+            def get_daily_report(activity):
+                return self.session.get(
+                    f"{BACKEND_URL}/reports/daily/individual",
+                    params={"date": activity[0]},
+                    headers=headers
+                )
+            
+            # The PUTs are independent, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                put_responses = list(executor.map(put_activity, test_activities))
+            
+            for (date_str, label, *_), response in zip(test_activities, put_responses):
                 if response.status_code == 200:
                     print_success(f"✅ Created {label} activity for {date_str}")
                 else:
@@ -313,15 +375,13 @@ class DateCalculationDebugger:
             # Test daily reports for specific dates
             print_info("Testing daily reports for specific dates...")
             
-            for date_str, label, expected_contacts, expected_appointments, expected_premium in test_activities:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                daily_responses = list(executor.map(get_daily_report, test_activities))
+            
+            for activity, daily_response in zip(test_activities, daily_responses):
+                date_str, label, expected_contacts, expected_appointments, expected_premium = activity
                 print_info(f"Testing daily report for {date_str} ({label})...")
                 
-                daily_response = self.session.get(
-                    f"{BACKEND_URL}/reports/daily/individual",
-                    params={"date": date_str},
-                    headers=headers
-                )
-                
                 if daily_response.status_code == 200:
                     daily_data = daily_response.json()
                     
@@ -336,16 +396,15 @@ class DateCalculationDebugger:
                     
                     # Look for our distinctive activity
                     data_array = daily_data.get('data', [])
-                    found_activity = False
+                    found_activity = any(
+                        math.isclose(m.get('contacts', 0), expected_contacts) and
+                        math.isclose(m.get('premium', 0), expected_premium)
+                        for m in data_array
+                    )
                     
-                    for member in data_array:
-                        if (member.get('contacts', 0) == expected_contacts and 
-                            member.get('premium', 0) == expected_premium):
-                            found_activity = True
-                            print_success(f"✅ Found {label} activity in daily report")
-                            break
-                    
-                    if not found_activity:
+                    if found_activity:
+                        print_success(f"✅ Found {label} activity in daily report")
+                    else:
                         print_warning(f"⚠️  Could not find {label} activity in daily report")
                         
                 else:
@@ -362,8 +421,6 @@ class DateCalculationDebugger:
         
         try:
             # Test Python's weekday calculation
-            from datetime import date
-            
             # Test specific dates mentioned in the issue
             test_dates = [
                 "2024-11-18",  # Monday
@@ -374,10 +431,9 @@ class DateCalculationDebugger:
             
             print_info("Testing Python weekday calculation:")
             for date_str in test_dates:
-                test_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                test_date = date.fromisoformat(date_str)
                 weekday_num = test_date.weekday()  # 0=Monday, 6=Sunday
-                weekday_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-                weekday_name = weekday_names[weekday_num]
+                weekday_name = WEEKDAY_NAMES[weekday_num]
                 
                 print_info(f"   {date_str} -> {weekday_name} (weekday={weekday_num})")
                 
@@ -391,7 +447,7 @@ class DateCalculationDebugger:
             
             # Test week calculation from a Wednesday
             print_info("\nTesting week calculation from Wednesday 2024-11-20:")
-            wednesday = datetime.strptime("2024-11-20", '%Y-%m-%d').date()
+            wednesday = date.fromisoformat("2024-11-20")
             monday_of_week = wednesday - timedelta(days=wednesday.weekday())
             
             print_info(f"   Wednesday: {wednesday}")
@@ -401,16 +457,12 @@ class DateCalculationDebugger:
             week_dates = []
             for i in range(7):
                 day_date = monday_of_week + timedelta(days=i)
-                day_name = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'][i]
+                day_name = WEEKDAY_NAMES[i]
                 week_dates.append((day_name, day_date.isoformat()))
                 print_info(f"   {day_name}: {day_date.isoformat()}")
             
             # Check if Wednesday is 11-20
-            wednesday_date = None
-            for day_name, day_date in week_dates:
-                if day_name == 'Wednesday':
-                    wednesday_date = day_date
-                    break
+            wednesday_date = week_dates[WEEKDAY_INDEX['Wednesday']][1]
             
             if wednesday_date == "2024-11-20":
                 print_success("✅ Week calculation correctly places Wednesday on 2024-11-20")
@@ -13,13 +13,17 @@ ROOT CAUSE ANALYSIS:
 
 import requests
 import json
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import sys
 import os
-from pytz import timezone as pytz_timezone
+from zoneinfo import ZoneInfo
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 BACKEND_URL = "https://interviewplus.preview.emergentagent.com/api"
+CENTRAL_TZ = ZoneInfo('America/Chicago')
 
 class Colors:
     GREEN = '\033[92m'
@@ -29,27 +33,50 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Color + icon prefix for each message level
+_LEVELS = {
+    'ok': f"{Colors.GREEN}✅ ",
+    'err': f"{Colors.RED}❌ ",
+    'warn': f"{Colors.YELLOW}⚠️  ",
+    'info': f"{Colors.BLUE}ℹ️  ",
+    'header': f"{Colors.BOLD}{Colors.BLUE}",
+}
+_HEADER_RULE = '=' * 80
+
+def _p(level, message):
+    sys.stdout.write(f"{_LEVELS[level]}{message}{Colors.ENDC}\n")
+
 def print_success(message):
-    print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
+    _p('ok', message)
 
 def print_error(message):
-    print(f"{Colors.RED}❌ {message}{Colors.ENDC}")
+    _p('err', message)
 
 def print_warning(message):
-    print(f"{Colors.YELLOW}⚠️  {message}{Colors.ENDC}")
+    _p('warn', message)
 
 def print_info(message):
-    print(f"{Colors.BLUE}ℹ️  {message}{Colors.ENDC}")
+    _p('info', message)
 
 def print_header(message):
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{message}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
+    sys.stdout.write("\n")
+    _p('header', _HEADER_RULE)
+    _p('header', message)
+    _p('header', _HEADER_RULE)
 
 class DateMismatchDebugger:
     def __init__(self):
         self.session = requests.Session()
+        # Larger pool for the concurrent probes, with retries on transient gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
         self.token = None
+        self.today_central = datetime.now(CENTRAL_TZ).date()
+        self.today_str = self.today_central.isoformat()
         self.test_results = {
             'passed': 0,
             'failed': 0,
@@ -80,20 +107,13 @@ class DateMismatchDebugger:
             print_error(f"Authentication exception: {str(e)}")
             return False
 
-    def debug_activity_save_date(self):
+    def debug_activity_save_date(self, headers):
         """DEBUG TEST 1: Check Activity Save Date"""
         print_header("🔍 DEBUG TEST 1: ACTIVITY SAVE DATE INVESTIGATION")
         
-        if not self.token:
-            print_error("No authentication token")
-            return
-            
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         # Get current Central Time
-        central_tz = pytz_timezone('America/Chicago')
-        today_central = datetime.now(central_tz).date()
-        today_str = today_central.isoformat()
+        today_central = self.today_central
+        today_str = self.today_str
         
         print_info(f"Today in Central Time: {today_str}")
         print_info(f"Day of week: {today_central.strftime('%A')}")
@@ -126,19 +146,19 @@ class DateMismatchDebugger:
             
             # Now fetch the activity back to see what date was actually saved
             print_info("Fetching saved activity to verify date...")
-            my_activities_response = self.session.get(f"{BACKEND_URL}/activities/my", headers=headers)
+            my_activities_response = self.session.get(
+                f"{BACKEND_URL}/activities/my",
+                params={"date": today_str},
+                headers=headers
+            )
             
             if my_activities_response.status_code == 200:
                 activities = my_activities_response.json()
-                today_activity = None
-                
-                print_info("All activities in database:")
-                for activity in activities[:5]:  # Show first 5
-                    print_info(f"  Date: {activity.get('date')} | Contacts: {activity.get('contacts', 0)} | Premium: ${activity.get('premium', 0)}")
-                    if activity.get('date') == today_str:
-                        today_activity = activity
+                today_activity = next((a for a in activities if a['date'] == today_str), None)
                 
                 if today_activity:
+                    print_info(f"  Date: {today_activity.get('date')} | Contacts: {today_activity.get('contacts', 0)} | Premium: ${today_activity.get('premium', 0)}")
+                    
                     saved_date = today_activity.get('date')
                     print_success(f"✅ FOUND: Activity saved with date: {saved_date}")
                     
@@ -161,16 +181,10 @@ class DateMismatchDebugger:
             print_error(f"Exception in activity save test: {str(e)}")
             self.test_results['failed'] += 1
 
-    def debug_weekly_date_calculation(self):
+    def debug_weekly_date_calculation(self, headers):
         """DEBUG TEST 2: Check Weekly View Date Calculation"""
         print_header("🔍 DEBUG TEST 2: WEEKLY DATE CALCULATION INVESTIGATION")
         
-        if not self.token:
-            print_error("No authentication token")
-            return
-            
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         try:
             # Get week dates from the API
             response = self.session.get(f"{BACKEND_URL}/team/week-dates", headers=headers)
@@ -187,8 +201,7 @@ class DateMismatchDebugger:
                 print_info(f"API says week starts: {week_start}")
                 
                 # Get actual Central Time today for comparison
-                central_tz = pytz_timezone('America/Chicago')
-                actual_today = datetime.now(central_tz).date().isoformat()
+                actual_today = self.today_str
                 
                 print_info(f"Actual Central Time today: {actual_today}")
                 
@@ -227,18 +240,12 @@ class DateMismatchDebugger:
             print_error(f"Exception in weekly date calculation test: {str(e)}")
             self.test_results['failed'] += 1
 
-    def debug_date_string_comparison(self):
+    def debug_date_string_comparison(self, headers):
         """DEBUG TEST 3: Compare Storage vs Lookup Dates"""
         print_header("🔍 DEBUG TEST 3: DATE STRING COMPARISON (STORAGE VS LOOKUP)")
         
-        if not self.token:
-            print_error("No authentication token")
-            return
-            
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         # Use Wednesday date if we found it, otherwise use today
-        test_date = getattr(self, 'wednesday_date', datetime.now(pytz_timezone('America/Chicago')).date().isoformat())
+        test_date = getattr(self, 'wednesday_date', self.today_str)
         
         print_info(f"Testing date string comparison for: {test_date}")
         
@@ -268,20 +275,22 @@ class DateMismatchDebugger:
             
             # Step 2: Check what's stored in database
             print_info("Step 2: Checking stored activity...")
-            my_activities_response = self.session.get(f"{BACKEND_URL}/activities/my", headers=headers)
+            my_activities_response = self.session.get(
+                f"{BACKEND_URL}/activities/my",
+                params={"date": test_date},
+                headers=headers
+            )
             
             stored_activity = None
             if my_activities_response.status_code == 200:
                 activities = my_activities_response.json()
-                for activity in activities:
-                    if activity.get('date') == test_date:
-                        stored_activity = activity
-                        break
+                stored_activity = next((a for a in activities if a['date'] == test_date), None)
                 
                 if stored_activity:
-                    stored_date = stored_activity.get('date')
-                    stored_contacts = stored_activity.get('contacts', 0)
-                    stored_premium = stored_activity.get('premium', 0)
+                    # Activity documents always carry these fields
+                    stored_date = stored_activity['date']
+                    stored_contacts = stored_activity['contacts']
+                    stored_premium = stored_activity['premium']
                     
                     print_success(f"✅ STORED: Date={stored_date}, Contacts={stored_contacts}, Premium=${stored_premium}")
                 else:
@@ -289,13 +298,25 @@ class DateMismatchDebugger:
                     self.test_results['failed'] += 1
                     return
             
+            # Steps 3 and 4 don't depend on each other, so fetch both concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                hierarchy_future = executor.submit(
+                    self.session.get,
+                    f"{BACKEND_URL}/team/hierarchy/daily",
+                    params={"user_date": test_date},
+                    headers=headers
+                )
+                daily_future = executor.submit(
+                    self.session.get,
+                    f"{BACKEND_URL}/reports/daily/individual",
+                    params={"date": test_date},
+                    headers=headers
+                )
+                hierarchy_response = hierarchy_future.result()
+                daily_response = daily_future.result()
+            
             # Step 3: Check what team hierarchy returns for this date
             print_info("Step 3: Checking team hierarchy lookup...")
-            hierarchy_response = self.session.get(
-                f"{BACKEND_URL}/team/hierarchy/daily",
-                params={"user_date": test_date},
-                headers=headers
-            )
             
             if hierarchy_response.status_code == 200:
                 hierarchy_data = hierarchy_response.json()
@@ -328,11 +349,6 @@ class DateMismatchDebugger:
                 
             # Step 4: Check daily report endpoint
             print_info("Step 4: Checking daily report lookup...")
-            daily_response = self.session.get(
-                f"{BACKEND_URL}/reports/daily/individual",
-                params={"date": test_date},
-                headers=headers
-            )
             
             if daily_response.status_code == 200:
                 daily_data = daily_response.json()
@@ -352,14 +368,13 @@ class DateMismatchDebugger:
                 
                 # Check if data appears in the report
                 data_array = daily_data.get('data', [])
-                found_data = False
-                for member in data_array:
-                    if member.get('contacts', 0) == 30.0 and member.get('premium', 0) == 5500.0:
-                        found_data = True
-                        print_success(f"✅ Found matching data in daily report for {member.get('name', 'Unknown')}")
-                        break
-                
-                if not found_data and data_array:
+                matching_member = next(
+                    (m for m in data_array if m.get('contacts', 0) == 30.0 and m.get('premium', 0) == 5500.0),
+                    None
+                )
+                if matching_member:
+                    print_success(f"✅ Found matching data in daily report for {matching_member.get('name', 'Unknown')}")
+                elif data_array:
                     print_warning("⚠️ Test data not found in daily report (may be aggregated)")
                     
             else:
@@ -370,23 +385,13 @@ class DateMismatchDebugger:
             print_error(f"Exception in date string comparison test: {str(e)}")
             self.test_results['failed'] += 1
 
-    def debug_timezone_edge_cases(self):
+    def debug_timezone_edge_cases(self, headers):
         """DEBUG TEST 4: Timezone Edge Case Testing"""
         print_header("🔍 DEBUG TEST 4: TIMEZONE EDGE CASE INVESTIGATION")
         
-        if not self.token:
-            print_error("No authentication token")
-            return
-            
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
-        # Test multiple timezone scenarios
-        central_tz = pytz_timezone('America/Chicago')
-        utc_tz = pytz_timezone('UTC')
-        
-        # Get current time in different timezones
-        now_central = datetime.now(central_tz)
-        now_utc = datetime.now(utc_tz)
+        # Get current time once in UTC and derive Central from it
+        now_utc = datetime.now(timezone.utc)
+        now_central = now_utc.astimezone(CENTRAL_TZ)
         
         central_date = now_central.date().isoformat()
         utc_date = now_utc.date().isoformat()
@@ -403,15 +408,17 @@ class DateMismatchDebugger:
             print_warning("This could cause the 'day behind' issue if backend uses UTC but frontend expects Central")
         
         try:
-            # Test with both dates to see if there's a difference
-            test_dates = [
-                (central_date, "Central Time Date"),
-                (utc_date, "UTC Date")
-            ]
+            # Test with both dates to see if there's a difference; when they
+            # match a second PUT/GET pair adds no information
+            if central_date == utc_date:
+                test_dates = [(central_date, "Central Time Date")]
+            else:
+                test_dates = [
+                    (central_date, "Central Time Date"),
+                    (utc_date, "UTC Date")
+                ]
             
-            for test_date, description in test_dates:
-                print_info(f"Testing {description}: {test_date}")
-                
+            def put_then_fetch_report(test_date):
                 # Create activity
                 activity_data = {
                     "date": test_date,
@@ -431,15 +438,23 @@ class DateMismatchDebugger:
                     headers=headers
                 )
                 
-                if create_response.status_code == 200:
-                    print_success(f"✅ Activity created for {description}")
-                
-                # Test daily report
+                # Test daily report (must follow the PUT for the same date)
                 daily_response = self.session.get(
                     f"{BACKEND_URL}/reports/daily/individual",
                     params={"date": test_date},
                     headers=headers
                 )
+                return create_response, daily_response
+            
+            # Dates are independent of each other, so run them concurrently
+            with ThreadPoolExecutor(max_workers=len(test_dates)) as executor:
+                responses = list(executor.map(put_then_fetch_report, [d for d, _ in test_dates]))
+            
+            for (test_date, description), (create_response, daily_response) in zip(test_dates, responses):
+                print_info(f"Testing {description}: {test_date}")
+                
+                if create_response.status_code == 200:
+                    print_success(f"✅ Activity created for {description}")
                 
                 if daily_response.status_code == 200:
                     daily_data = daily_response.json()
@@ -470,11 +485,18 @@ class DateMismatchDebugger:
             print_error("Authentication failed - cannot proceed")
             return False
         
-        # Run all debug tests
-        self.debug_activity_save_date()
-        self.debug_weekly_date_calculation()
-        self.debug_date_string_comparison()
-        self.debug_timezone_edge_cases()
+        headers = {"Authorization": f"Bearer {self.token}"}
+        
+        # Run all debug tests in order (date string comparison reuses the
+        # Wednesday date found by the weekly calculation test)
+        debug_tests = (
+            self.debug_activity_save_date,
+            self.debug_weekly_date_calculation,
+            self.debug_date_string_comparison,
+            self.debug_timezone_edge_cases,
+        )
+        for debug_test in debug_tests:
+            debug_test(headers)
         
         # Print comprehensive summary
         self.print_debug_summary()
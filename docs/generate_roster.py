@@ -17,12 +17,26 @@ import csv
 import os
 import re
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from motor.motor_asyncio import AsyncIOMotorClient
 
 # MongoDB connection
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 DB_NAME = os.environ.get('DB_NAME', 'pma_agent')
 
+# Characters stripped from team names when building filenames
+_SAFE_NAME_RE = re.compile(r'[^\w\s-]')
+
+# Role order for sorting
+_ROLE_ORDER = {
+    'super_admin': 0,
+    'state_manager': 1,
+    'regional_manager': 2,
+    'district_manager': 3,
+    'agent': 4
+}
+
 async def generate_rosters():
     # Connect to MongoDB
     client = AsyncIOMotorClient(MONGO_URL)
@@ -32,49 +46,33 @@ async def generate_rosters():
     output_dir = '/app/docs/rosters'
     os.makedirs(output_dir, exist_ok=True)
     
-    # Get all teams
-    teams = await db.teams.find({}, {"_id": 0}).to_list(100)
-    team_dict = {t['id']: t['name'] for t in teams}
-    
-    # Get all users
-    users = await db.users.find(
-        {"$or": [{"status": "active"}, {"status": {"$exists": False}}]},
-        {"_id": 0, "password_hash": 0}
-    ).to_list(10000)
-    
-    # Build user lookup for manager names
-    user_dict = {u['id']: u for u in users}
-    
-    # Group users by team
+    # Stream active users, building the manager lookup and team groups in one pass
+    user_dict = {}
     users_by_team = {}
-    for user in users:
-        team_id = user.get('team_id', 'unassigned')
-        if team_id not in users_by_team:
-            users_by_team[team_id] = []
-        users_by_team[team_id].append(user)
+    cursor = db.users.find(
+        {"$or": [{"status": "active"}, {"status": {"$exists": False}}]},
+        {"_id": 0, "id": 1, "name": 1, "email": 1, "role": 1, "team_id": 1, "manager_id": 1, "status": 1}
+    )
+    async for user in cursor:
+        user_dict[user['id']] = user
+        users_by_team.setdefault(user.get('team_id', 'unassigned'), []).append(user)
     
-    # Role order for sorting
-    role_order = {
-        'super_admin': 0,
-        'state_manager': 1,
-        'regional_manager': 2,
-        'district_manager': 3,
-        'agent': 4
+    # Only look up the teams that active users actually belong to
+    team_ids = [tid for tid in users_by_team if tid != 'unassigned']
+    team_dict = {
+        t['id']: t['name']
+        async for t in db.teams.find({"id": {"$in": team_ids}}, {"_id": 0, "id": 1, "name": 1})
     }
     
     all_rows = []
     
-    # Generate roster for each team
+    # Build roster rows for each team
     for team_id, team_users in users_by_team.items():
         if team_id == 'unassigned':
             team_name = 'Unassigned'
         else:
             team_name = team_dict.get(team_id, 'Unknown Team')
         
-        # Sort by role, then name
-        team_users.sort(key=lambda u: (role_order.get(u.get('role', 'agent'), 5), u.get('name', '')))
-        
-        rows = []
         for user in team_users:
             manager_id = user.get('manager_id')
             if manager_id and manager_id in user_dict:
@@ -87,37 +85,59 @@ async def generate_rosters():
                 'Email': user.get('email', ''),
                 'Role': format_role(user.get('role', '')),
                 'Reports To': reports_to,
-                'Team': team_name
+                'Team': team_name,
+                '_order': _ROLE_ORDER.get(user.get('role', 'agent'), 5)
             }
-            rows.append(row)
             all_rows.append(row)
+    
+    # Sort all rows by team, then role, then name; each team's slice is then
+    # already in roster order, so one sort serves both outputs
+    all_rows.sort(key=lambda r: (r['Team'], r['_order'], r['Name']))
+    
+    write_tasks = []
+    written = []
+    used_filenames = set()
+    for team_name, team_rows in groupby(all_rows, key=itemgetter('Team')):
+        rows = list(team_rows)
         
-        # Write team-specific CSV
-        safe_team_name = re.sub(r'[^\w\s-]', '', team_name).replace(' ', '_')
+        # Write team-specific CSV. Distinct names can sanitize to the same
+        # filename ("A&B" and "AB"), so suffix repeats; no two concurrent
+        # writes may target one path
+        safe_team_name = _SAFE_NAME_RE.sub('', team_name).replace(' ', '_')
         filename = f"{output_dir}/team_roster_{safe_team_name}.csv"
+        suffix = 2
+        while filename in used_filenames:
+            filename = f"{output_dir}/team_roster_{safe_team_name}_{suffix}.csv"
+            suffix += 1
+        used_filenames.add(filename)
         
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['Name', 'Email', 'Role', 'Reports To'])
-            writer.writeheader()
-            for row in rows:
-                writer.writerow({k: v for k, v in row.items() if k != 'Team'})
-        
-        print(f"✓ Generated: {filename} ({len(rows)} users)")
+        write_tasks.append(asyncio.to_thread(write_team_csv, filename, rows))
+        written.append((filename, len(rows)))
+    
+    # Write team-specific CSVs concurrently off the event loop
+    await asyncio.gather(*write_tasks)
+    for filename, count in written:
+        print(f"✓ Generated: {filename} ({count} users)")
     
     # Write combined roster
     combined_filename = f"{output_dir}/all_teams_roster.csv"
     with open(combined_filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['Team', 'Name', 'Email', 'Role', 'Reports To'])
-        writer.writeheader()
-        # Sort all rows by team, then role, then name
-        all_rows.sort(key=lambda r: (r['Team'], role_order.get(r['Role'].lower().replace(' ', '_'), 5), r['Name']))
-        writer.writerows(all_rows)
+        writer = csv.writer(f)
+        writer.writerow(['Team', 'Name', 'Email', 'Role', 'Reports To'])
+        writer.writerows((r['Team'], r['Name'], r['Email'], r['Role'], r['Reports To']) for r in all_rows)
     
     print(f"\n✓ Generated combined roster: {combined_filename} ({len(all_rows)} total users)")
     print(f"\nGenerated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     client.close()
 
+def write_team_csv(filename, rows):
+    """Write a single team's roster CSV"""
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Name', 'Email', 'Role', 'Reports To'])
+        writer.writerows((r['Name'], r['Email'], r['Role'], r['Reports To']) for r in rows)
+
 def format_role(role):
     """Format role for display"""
     return role.replace('_', ' ').title()
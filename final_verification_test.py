@@ -6,13 +6,30 @@ Verify that the date calculation fix resolves the user's issue
 
 import requests
 import json
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 import sys
 import os
 from pytz import timezone as pytz_timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 BACKEND_URL = "https://interviewplus.preview.emergentagent.com/api"
+CENTRAL_TZ = pytz_timezone('America/Chicago')
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Distinctive activity values written for today and then looked up in the reports
+_TEST_ACTIVITY_TEMPLATE = {
+    "contacts": 777.0,
+    "appointments": 77.0,
+    "presentations": 7.0,
+    "referrals": 7,
+    "testimonials": 7,
+    "sales": 7,
+    "new_face_sold": 7.0,
+    "premium": 7777.0
+}
 
 class Colors:
     GREEN = '\033[92m'
@@ -22,27 +39,53 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Plain output when piped to a log or when NO_COLOR is set
+if os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+    Colors.GREEN = Colors.RED = Colors.YELLOW = Colors.BLUE = Colors.ENDC = Colors.BOLD = ''
+
+# Prebuilt color prefixes/suffix so each helper is a single write
+_SUCCESS_PFX = f"{Colors.GREEN}✅ "
+_ERROR_PFX = f"{Colors.RED}❌ "
+_WARNING_PFX = f"{Colors.YELLOW}⚠️  "
+_INFO_PFX = f"{Colors.BLUE}ℹ️  "
+_HEADER_PFX = f"{Colors.BOLD}{Colors.BLUE}"
+_HEADER_RULE = f"{_HEADER_PFX}{'='*80}{Colors.ENDC}\n"
+_RESET = f"{Colors.ENDC}\n"
+
 def print_success(message):
-    print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
+    sys.stdout.write(_SUCCESS_PFX + str(message) + _RESET)
 
 def print_error(message):
-    print(f"{Colors.RED}❌ {message}{Colors.ENDC}")
+    sys.stdout.write(_ERROR_PFX + str(message) + _RESET)
 
 def print_warning(message):
-    print(f"{Colors.YELLOW}⚠️  {message}{Colors.ENDC}")
+    sys.stdout.write(_WARNING_PFX + str(message) + _RESET)
 
 def print_info(message):
-    print(f"{Colors.BLUE}ℹ️  {message}{Colors.ENDC}")
+    sys.stdout.write(_INFO_PFX + str(message) + _RESET)
 
 def print_header(message):
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{message}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
+    sys.stdout.write("\n" + _HEADER_RULE + _HEADER_PFX + str(message) + _RESET + _HEADER_RULE)
 
 class FinalVerificationTester:
     def __init__(self):
         self.session = requests.Session()
+        # Keep-alive pool with retries for transient gateway errors on the preview host
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({"Accept": "application/json"})
         self.token = None
+        # (token, Central date) -> successful GET /team/week-dates response
+        self._week_dates_cache = {}
+
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
 
     def login_user(self):
         """Login with existing state manager"""
@@ -55,6 +98,8 @@ class FinalVerificationTester:
             if response.status_code == 200:
                 data = response.json()
                 self.token = data['token']
+                # Every later request authenticates through the session
+                self.session.headers["Authorization"] = f"Bearer {self.token}"
                 print_success(f"Logged in as: {data['user']['name']}")
                 return True
             else:
@@ -65,29 +110,45 @@ class FinalVerificationTester:
             print_error(f"Login exception: {str(e)}")
             return False
 
-    def verify_date_fix(self):
-        """Verify that the date calculation now works correctly"""
+    def _get_week_dates(self, today_iso):
+        """GET /team/week-dates, reusing a successful response for the same token and Central date"""
+        key = (self.token, today_iso)
+        if key in self._week_dates_cache:
+            return self._week_dates_cache[key]
+        
+        response = self.session.get(f"{BACKEND_URL}/team/week-dates")
+        if response.status_code == 200:
+            self._week_dates_cache[key] = response
+        return response
+
+    def verify_date_fix(self, week_dates_future=None):
+        """Verify that the date calculation now works correctly
+        
+        week_dates_future, when given, is an in-flight GET /team/week-dates started by run_final_verification.
+        """
         print_header("🔧 VERIFYING DATE CALCULATION FIX")
         
         if not self.token:
             print_error("No authentication token")
             return False
             
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         try:
             # Get current system date context
-            central_tz = pytz_timezone('America/Chicago')
-            central_now = datetime.now(central_tz)
+            central_now = datetime.now(CENTRAL_TZ)
             central_date = central_now.date()
+            central_date_iso = central_date.isoformat()
+            system_today_day = WEEKDAY_NAMES[central_date.weekday()]
             
             print_info(f"🕐 Current Central Time: {central_now}")
             print_info(f"📅 Current Central Date: {central_date}")
-            print_info(f"📊 Current Weekday: {central_date.strftime('%A')} (weekday={central_date.weekday()})")
+            print_info(f"📊 Current Weekday: {system_today_day} (weekday={central_date.weekday()})")
             
             # Test the API
             print_info("\n🔍 Testing GET /api/team/week-dates...")
-            response = self.session.get(f"{BACKEND_URL}/team/week-dates", headers=headers)
+            if week_dates_future is not None:
+                response = week_dates_future.result()
+            else:
+                response = self._get_week_dates(central_date_iso)
             
             if response.status_code == 200:
                 data = response.json()
@@ -99,33 +160,24 @@ class FinalVerificationTester:
                 print_info(f"📅 API says today is: {api_today}")
                 
                 # Check if API date matches system date
-                if api_today == central_date.isoformat():
+                if api_today == central_date_iso:
                     print_success("✅ API date matches system date")
                 else:
-                    print_error(f"❌ API date mismatch: API={api_today}, System={central_date.isoformat()}")
+                    print_error(f"❌ API date mismatch: API={api_today}, System={central_date_iso}")
                     return False
                 
-                # Find today and Wednesday in the response
-                today_info = None
-                wednesday_info = None
-                
                 print_info("\n📅 Week dates from API:")
                 for date_info in week_dates:
-                    day_name = date_info.get('day_name', '')
-                    date_str = date_info.get('date', '')
-                    is_today = date_info.get('is_today', False)
-                    
-                    print_info(f"   {day_name}: {date_str} {'(TODAY)' if is_today else ''}")
-                    
-                    if is_today:
-                        today_info = date_info
-                    if day_name == 'Wednesday':
-                        wednesday_info = date_info
+                    print_info(f"   {date_info.get('day_name', '')}: {date_info.get('date', '')} {'(TODAY)' if date_info.get('is_today', False) else ''}")
+                
+                # Find today and Wednesday in the response
+                by_day = {date_info.get('day_name', ''): date_info for date_info in week_dates}
+                today_info = next((date_info for date_info in week_dates if date_info.get('is_today')), None)
+                wednesday_info = by_day.get('Wednesday')
                 
                 # Verify today is correctly identified
                 if today_info:
                     api_today_day = today_info.get('day_name', '')
-                    system_today_day = central_date.strftime('%A')
                     
                     if api_today_day == system_today_day:
                         print_success(f"✅ Today correctly identified as {api_today_day}")
@@ -140,8 +192,8 @@ class FinalVerificationTester:
                     
                     # Parse the Wednesday date to check the weekday
                     try:
-                        wed_date_obj = datetime.fromisoformat(wednesday_date).date()
-                        wed_weekday = wed_date_obj.strftime('%A')
+                        wed_date_obj = date.fromisoformat(wednesday_date)
+                        wed_weekday = WEEKDAY_NAMES[wed_date_obj.weekday()]
                         
                         if wed_weekday == 'Wednesday':
                             print_success(f"✅ Wednesday date ({wednesday_date}) is actually a Wednesday")
@@ -158,7 +210,7 @@ class FinalVerificationTester:
                 print_info("   User reported: 'Wednesday slot shows date 11-20, but activity appears in Tuesday slot (11-19)'")
                 print_info("   User expected: 'Activity in Wednesday slot (11-19)'")
                 
-                if central_date.strftime('%A') == 'Wednesday':
+                if system_today_day == 'Wednesday':
                     if '11-19' in api_today:
                         print_success("✅ ISSUE RESOLVED: Today is Wednesday 11-19 (matches user expectation)")
                         print_success("✅ User's activity should now appear in Wednesday slot correctly")
@@ -167,7 +219,7 @@ class FinalVerificationTester:
                         print_warning(f"⚠️  Today is Wednesday but date is {api_today} (not 11-19)")
                         return False
                 else:
-                    print_info(f"ℹ️  Today is {central_date.strftime('%A')}, not Wednesday")
+                    print_info(f"ℹ️  Today is {system_today_day}, not Wednesday")
                     print_info("   Cannot verify Wednesday-specific issue, but date calculation appears correct")
                     return True
                     
@@ -179,54 +231,64 @@ class FinalVerificationTester:
             print_error(f"❌ Exception in verification: {str(e)}")
             return False
 
-    def test_activity_consistency(self):
-        """Test that activities appear in the correct date slots"""
+    def _create_and_fetch_activity(self, today_date):
+        """PUT today's test activity, then fetch the weekly hierarchy and daily report together
+        
+        The report responses are None when the PUT fails.
+        """
+        activity_data = {"date": today_date, **_TEST_ACTIVITY_TEMPLATE}
+        
+        response = self.session.put(
+            f"{BACKEND_URL}/activities/{today_date}",
+            json=activity_data
+        )
+        if response.status_code != 200:
+            # Nothing to look for in the reports if the activity was not saved
+            return response, None, None
+        
+        # Own pool for the report GETs: this method may itself be running on a pool
+        # worker, and waiting on that same pool would deadlock once it is full
+        with ThreadPoolExecutor(max_workers=2) as report_executor:
+            hierarchy_future = report_executor.submit(self.session.get, f"{BACKEND_URL}/team/hierarchy/weekly")
+            daily_future = report_executor.submit(
+                self.session.get,
+                f"{BACKEND_URL}/reports/daily/individual",
+                params={"date": today_date}
+            )
+            return response, hierarchy_future.result(), daily_future.result()
+
+    def test_activity_consistency(self, activity_future=None, today_date=None):
+        """Test that activities appear in the correct date slots
+        
+        activity_future, when given, is an in-flight _create_and_fetch_activity call for today_date.
+        """
         print_header("🎯 ACTIVITY CONSISTENCY TEST")
         
         if not self.token:
             print_error("No authentication token")
             return False
             
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         try:
             # Create a test activity for today
-            central_tz = pytz_timezone('America/Chicago')
-            today_date = datetime.now(central_tz).date().isoformat()
+            if today_date is None:
+                today_date = datetime.now(CENTRAL_TZ).date().isoformat()
             
             print_info(f"Creating test activity for today ({today_date})...")
             
-            activity_data = {
-                "date": today_date,
-                "contacts": 777.0,
-                "appointments": 77.0,
-                "presentations": 7.0,
-                "referrals": 7,
-                "testimonials": 7,
-                "sales": 7,
-                "new_face_sold": 7.0,
-                "premium": 7777.0
-            }
-            
-            response = self.session.put(
-                f"{BACKEND_URL}/activities/{today_date}",
-                json=activity_data,
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                print_success(f"✅ Created test activity for {today_date}")
+            if activity_future is not None:
+                response, hierarchy_response, daily_response = activity_future.result()
             else:
+                response, hierarchy_response, daily_response = self._create_and_fetch_activity(today_date)
+            
+            if response.status_code != 200:
                 print_warning(f"⚠️  Could not create test activity: {response.status_code}")
+                return False
+            
+            print_success(f"✅ Created test activity for {today_date}")
             
             # Test that the activity appears in the correct weekly view
             print_info("Testing weekly hierarchy view...")
             
-            hierarchy_response = self.session.get(
-                f"{BACKEND_URL}/team/hierarchy/weekly",
-                headers=headers
-            )
-            
             if hierarchy_response.status_code == 200:
                 hierarchy_data = hierarchy_response.json()
                 stats = hierarchy_data.get('stats', {})
@@ -235,7 +297,8 @@ class FinalVerificationTester:
                 
                 print_info(f"📊 Weekly totals: {total_contacts} contacts, ${total_premium} premium")
                 
-                if total_contacts >= 777.0 and total_premium >= 7777.0:
+                if (total_contacts >= _TEST_ACTIVITY_TEMPLATE['contacts'] and
+                        total_premium >= _TEST_ACTIVITY_TEMPLATE['premium']):
                     print_success("✅ Today's test activity appears in weekly totals")
                 else:
                     print_warning("⚠️  Today's test activity may not appear in weekly totals")
@@ -246,12 +309,6 @@ class FinalVerificationTester:
             # Test daily report for today
             print_info(f"Testing daily report for {today_date}...")
             
-            daily_response = self.session.get(
-                f"{BACKEND_URL}/reports/daily/individual",
-                params={"date": today_date},
-                headers=headers
-            )
-            
             if daily_response.status_code == 200:
                 daily_data = daily_response.json()
                 
@@ -264,16 +321,16 @@ class FinalVerificationTester:
                 
                 # Look for our test activity
                 data_array = daily_data.get('data', [])
-                found_activity = False
-                
-                for member in data_array:
-                    if (member.get('contacts', 0) == 777.0 and 
-                        member.get('premium', 0) == 7777.0):
-                        found_activity = True
-                        print_success(f"✅ Found test activity in daily report for {member.get('name', 'Unknown')}")
-                        break
+                hit = next(
+                    (member for member in data_array
+                     if member.get('contacts') == _TEST_ACTIVITY_TEMPLATE['contacts'] and
+                     member.get('premium') == _TEST_ACTIVITY_TEMPLATE['premium']),
+                    None
+                )
                 
-                if not found_activity:
+                if hit:
+                    print_success(f"✅ Found test activity in daily report for {hit.get('name', 'Unknown')}")
+                else:
                     print_warning("⚠️  Test activity not found in daily report")
                     
             else:
@@ -291,14 +348,24 @@ class FinalVerificationTester:
         print_header("🎉 FINAL VERIFICATION OF DATE CALCULATION FIX")
         print_info("Verifying that the Wednesday date issue has been resolved")
         
-        # Login
-        if not self.login_user():
-            print_error("Failed to login")
-            return False
-        
-        # Run verification tests
-        date_fix_success = self.verify_date_fix()
-        activity_consistency_success = self.test_activity_consistency()
+        try:
+            # Login
+            if not self.login_user():
+                print_error("Failed to login")
+                return False
+            
+            # The week-dates GET and the activity PUT (plus its two report GETs) are independent,
+            # so all of them start now; each test then checks its responses in order
+            today_date = datetime.now(CENTRAL_TZ).date().isoformat()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                week_dates_future = executor.submit(self._get_week_dates, today_date)
+                activity_future = executor.submit(self._create_and_fetch_activity, today_date)
+                
+                # Run verification tests
+                date_fix_success = self.verify_date_fix(week_dates_future)
+                activity_consistency_success = self.test_activity_consistency(activity_future, today_date)
+        finally:
+            self.close()
         
         # Final summary
         print_header("🏁 FINAL SUMMARY")
@@ -41,9 +41,14 @@ CRITICAL TESTS:
 
 import requests
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 import sys
 import os
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 BACKEND_URL = "https://interviewplus.preview.emergentagent.com/api"
@@ -56,31 +61,67 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Output of a test running on a worker thread is collected here and written
+# out in test order once the test finishes, so concurrent tests don't interleave
+_captured = threading.local()
+
+def _write(text):
+    lines = getattr(_captured, 'lines', None)
+    if lines is None:
+        sys.stdout.write(text)
+    else:
+        lines.append(text)
+
 def print_success(message):
-    print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
+    _write(f"{Colors.GREEN}✅ {message}{Colors.ENDC}\n")
 
 def print_error(message):
-    print(f"{Colors.RED}❌ {message}{Colors.ENDC}")
+    _write(f"{Colors.RED}❌ {message}{Colors.ENDC}\n")
 
 def print_warning(message):
-    print(f"{Colors.YELLOW}⚠️  {message}{Colors.ENDC}")
+    _write(f"{Colors.YELLOW}⚠️  {message}{Colors.ENDC}\n")
 
 def print_info(message):
-    print(f"{Colors.BLUE}ℹ️  {message}{Colors.ENDC}")
+    _write(f"{Colors.BLUE}ℹ️  {message}{Colors.ENDC}\n")
 
 def print_header(message):
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{message}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    _write(f"\n{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+    _write(f"{Colors.BOLD}{Colors.BLUE}{message}{Colors.ENDC}\n")
+    _write(f"{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
 
 class PasswordChangeTester:
     def __init__(self):
         self.session = requests.Session()
+        # Keep-alive pool large enough for all concurrently running tests
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+        ))
         self.test_results = {
             'passed': 0,
             'failed': 0,
             'errors': []
         }
+        self._results_lock = threading.Lock()
+
+    def _record(self, passed=0, failed=0, error=None):
+        """Update test_results; tests run concurrently, so updates go through a lock"""
+        with self._results_lock:
+            self.test_results['passed'] += passed
+            self.test_results['failed'] += failed
+            if error:
+                self.test_results['errors'].append(error)
+
+    @staticmethod
+    def _run_captured(test):
+        """Run a test callable on a worker thread and return everything it printed"""
+        _captured.lines = []
+        try:
+            test()
+        finally:
+            lines, _captured.lines = _captured.lines, None
+        return ''.join(lines)
 
     def register_test_user(self, email, password, name, role):
         """Register a test user for password change testing"""
@@ -96,7 +137,7 @@ class PasswordChangeTester:
                 data = response.json()
                 print_success(f"Registered test user: {name} ({email})")
                 return data['token'], data['user']['id']
-            elif response.status_code == 400 and "already registered" in response.text:
+            elif response.status_code == 400 and b"already registered" in response.content:
                 # User exists, try to login
                 login_response = self.session.post(f"{BACKEND_URL}/auth/login", json={
                     "email": email,
@@ -116,6 +157,18 @@ class PasswordChangeTester:
             print_error(f"Exception registering {email}: {str(e)}")
             return None, None
 
+    def _login_old_and_new(self, email, old_password, new_password):
+        """Log in with the old and new password at the same time; returns (old_response, new_response)"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            old_future, new_future = (
+                executor.submit(self.session.post, f"{BACKEND_URL}/auth/login", json={
+                    "email": email,
+                    "password": password
+                })
+                for password in (old_password, new_password)
+            )
+            return old_future.result(), new_future.result()
+
     def test_valid_password_change(self):
         """Test 1: Valid Password Change"""
         print_header("TEST 1: VALID PASSWORD CHANGE")
@@ -133,7 +186,7 @@ class PasswordChangeTester:
         
         if not token:
             print_error("Failed to create test user - skipping valid password change test")
-            self.test_results['failed'] += 1
+            self._record(failed=1)
             return
         
         headers = {"Authorization": f"Bearer {token}"}
@@ -154,52 +207,45 @@ class PasswordChangeTester:
                 response_data = change_response.json()
                 if response_data.get('message') == "Password changed successfully":
                     print_success("Password change endpoint returned success message")
-                    self.test_results['passed'] += 1
+                    self._record(passed=1)
                 else:
                     print_error(f"Unexpected success message: {response_data.get('message')}")
-                    self.test_results['failed'] += 1
+                    self._record(failed=1)
                     return
             else:
                 print_error(f"Password change failed: {change_response.status_code} - {change_response.text}")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append(f"Valid password change failed: {change_response.status_code}")
+                self._record(failed=1, error=f"Valid password change failed: {change_response.status_code}")
                 return
             
+            # Steps 2 and 3 are independent logins, so both go out together
+            old_login_response, new_login_response = self._login_old_and_new(
+                "password.test.user@test.com", original_password, new_password
+            )
+            
             # Step 2: Verify old password no longer works
             print_info("Step 2: Verifying old password no longer works...")
-            old_login_response = self.session.post(f"{BACKEND_URL}/auth/login", json={
-                "email": "password.test.user@test.com",
-                "password": original_password
-            })
             
             if old_login_response.status_code == 401 or old_login_response.status_code == 400:
                 print_success("Old password correctly rejected")
-                self.test_results['passed'] += 1
+                self._record(passed=1)
             else:
                 print_error(f"Old password still works! Status: {old_login_response.status_code}")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append("Old password still works after change")
+                self._record(failed=1, error="Old password still works after change")
             
             # Step 3: Verify new password works
             print_info("Step 3: Verifying new password works...")
-            new_login_response = self.session.post(f"{BACKEND_URL}/auth/login", json={
-                "email": "password.test.user@test.com",
-                "password": new_password
-            })
-            
             if new_login_response.status_code == 200:
                 new_data = new_login_response.json()
                 if 'token' in new_data and 'user' in new_data:
                     print_success("New password login successful")
                     print_success("User can login with new password")
-                    self.test_results['passed'] += 1
+                    self._record(passed=1)
                 else:
                     print_error("New password login missing required fields")
-                    self.test_results['failed'] += 1
+                    self._record(failed=1)
             else:
                 print_error(f"New password login failed: {new_login_response.status_code} - {new_login_response.text}")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append("New password login failed")
+                self._record(failed=1, error="New password login failed")
             
             # Step 4: Verify user data integrity
             print_info("Step 4: Verifying user data integrity...")
@@ -209,16 +255,14 @@ class PasswordChangeTester:
                     new_user_data.get('email') == "password.test.user@test.com" and
                     new_user_data.get('name') == "Password Test User"):
                     print_success("User data integrity maintained after password change")
-                    self.test_results['passed'] += 1
+                    self._record(passed=1)
                 else:
                     print_error("User data corrupted after password change")
-                    self.test_results['failed'] += 1
-                    self.test_results['errors'].append("User data integrity compromised")
+                    self._record(failed=1, error="User data integrity compromised")
             
         except Exception as e:
             print_error(f"Exception in valid password change test: {str(e)}")
-            self.test_results['failed'] += 1
-            self.test_results['errors'].append(f"Valid password change exception: {str(e)}")
+            self._record(failed=1, error=f"Valid password change exception: {str(e)}")
 
     def test_incorrect_current_password(self):
         """Test 2: Current Password Validation"""
@@ -236,7 +280,7 @@ class PasswordChangeTester:
         
         if not token:
             print_error("Failed to create test user - skipping current password validation test")
-            self.test_results['failed'] += 1
+            self._record(failed=1)
             return
         
         headers = {"Authorization": f"Bearer {token}"}
@@ -258,15 +302,13 @@ class PasswordChangeTester:
                 
                 if "Current password is incorrect" in error_detail:
                     print_success("Correct error message for incorrect current password")
-                    self.test_results['passed'] += 1
+                    self._record(passed=1)
                 else:
                     print_error(f"Unexpected error message: {error_detail}")
-                    self.test_results['failed'] += 1
-                    self.test_results['errors'].append(f"Unexpected error message: {error_detail}")
+                    self._record(failed=1, error=f"Unexpected error message: {error_detail}")
             else:
                 print_error(f"Expected 400 status, got {change_response.status_code}")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append(f"Incorrect current password validation failed: {change_response.status_code}")
+                self._record(failed=1, error=f"Incorrect current password validation failed: {change_response.status_code}")
             
             # Verify original password still works
             print_info("Verifying original password still works...")
@@ -277,16 +319,14 @@ class PasswordChangeTester:
             
             if login_response.status_code == 200:
                 print_success("Original password still works (password unchanged)")
-                self.test_results['passed'] += 1
+                self._record(passed=1)
             else:
                 print_error("Original password no longer works - security issue!")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append("Password changed despite incorrect current password")
+                self._record(failed=1, error="Password changed despite incorrect current password")
             
         except Exception as e:
             print_error(f"Exception in current password validation test: {str(e)}")
-            self.test_results['failed'] += 1
-            self.test_results['errors'].append(f"Current password validation exception: {str(e)}")
+            self._record(failed=1, error=f"Current password validation exception: {str(e)}")
 
     def test_new_password_validation(self):
         """Test 3: New Password Validation"""
@@ -304,7 +344,7 @@ class PasswordChangeTester:
         
         if not token:
             print_error("Failed to create test user - skipping new password validation test")
-            self.test_results['failed'] += 1
+            self._record(failed=1)
             return
         
         headers = {"Authorization": f"Bearer {token}"}
@@ -317,10 +357,12 @@ class PasswordChangeTester:
             ("1", "1 character")
         ]
         
-        for new_password, description in test_cases:
-            try:
-                print_info(f"Testing with {description}: '{new_password}'")
-                change_response = self.session.post(
+        # All of these are rejected without changing the password, so send them together;
+        # only the POSTs run on the pool, output stays on this thread
+        with ThreadPoolExecutor(max_workers=len(test_cases)) as executor:
+            futures = [
+                executor.submit(
+                    self.session.post,
                     f"{BACKEND_URL}/auth/change-password",
                     json={
                         "current_password": current_password,
@@ -328,6 +370,13 @@ class PasswordChangeTester:
                     },
                     headers=headers
                 )
+                for new_password, _ in test_cases
+            ]
+        
+        for (new_password, description), future in zip(test_cases, futures):
+            try:
+                print_info(f"Testing with {description}: '{new_password}'")
+                change_response = future.result()
                 
                 if change_response.status_code == 400:
                     response_data = change_response.json()
@@ -335,20 +384,17 @@ class PasswordChangeTester:
                     
                     if "at least 6 characters" in error_detail:
                         print_success(f"Correct validation error for {description}")
-                        self.test_results['passed'] += 1
+                        self._record(passed=1)
                     else:
                         print_error(f"Unexpected error message for {description}: {error_detail}")
-                        self.test_results['failed'] += 1
-                        self.test_results['errors'].append(f"Unexpected validation error: {error_detail}")
+                        self._record(failed=1, error=f"Unexpected validation error: {error_detail}")
                 else:
                     print_error(f"Expected 400 status for {description}, got {change_response.status_code}")
-                    self.test_results['failed'] += 1
-                    self.test_results['errors'].append(f"Password validation failed for {description}: {change_response.status_code}")
+                    self._record(failed=1, error=f"Password validation failed for {description}: {change_response.status_code}")
                 
             except Exception as e:
                 print_error(f"Exception testing {description}: {str(e)}")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append(f"New password validation exception ({description}): {str(e)}")
+                self._record(failed=1, error=f"New password validation exception ({description}): {str(e)}")
 
     def test_authentication_required(self):
         """Test 4: Authentication Required"""
@@ -367,14 +413,13 @@ class PasswordChangeTester:
             
             if change_response.status_code == 401:
                 print_success("Correctly rejected request without authentication")
-                self.test_results['passed'] += 1
+                self._record(passed=1)
             elif change_response.status_code == 403:
                 print_success("Correctly rejected request without authentication (403)")
-                self.test_results['passed'] += 1
+                self._record(passed=1)
             else:
                 print_error(f"Expected 401/403 status, got {change_response.status_code}")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append(f"Authentication requirement failed: {change_response.status_code}")
+                self._record(failed=1, error=f"Authentication requirement failed: {change_response.status_code}")
             
             # Test with invalid token
             print_info("Testing with invalid authentication token...")
@@ -390,16 +435,14 @@ class PasswordChangeTester:
             
             if change_response.status_code == 401:
                 print_success("Correctly rejected request with invalid token")
-                self.test_results['passed'] += 1
+                self._record(passed=1)
             else:
                 print_error(f"Expected 401 status for invalid token, got {change_response.status_code}")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append(f"Invalid token handling failed: {change_response.status_code}")
+                self._record(failed=1, error=f"Invalid token handling failed: {change_response.status_code}")
             
         except Exception as e:
             print_error(f"Exception in authentication test: {str(e)}")
-            self.test_results['failed'] += 1
-            self.test_results['errors'].append(f"Authentication test exception: {str(e)}")
+            self._record(failed=1, error=f"Authentication test exception: {str(e)}")
 
     def test_user_roles_access(self):
         """Test 5: Different User Roles Can Change Password"""
@@ -413,63 +456,71 @@ class PasswordChangeTester:
             ("state_manager", "State Manager User")
         ]
         
-        for role, name in roles_to_test:
-            try:
-                print_info(f"Testing password change for role: {role}")
-                
-                original_password = f"{role}Password123!"
-                new_password = f"{role}NewPassword456!"
-                email = f"{role}.password.test@test.com"
-                
-                # Register user with specific role
-                token, user_id = self.register_test_user(
-                    email,
-                    original_password,
-                    name,
-                    role
-                )
-                
-                if not token:
-                    print_warning(f"Failed to create {role} user - skipping")
-                    continue
-                
-                headers = {"Authorization": f"Bearer {token}"}
+        # Each role has its own user, so the register -> change -> login chains run side by side
+        with ThreadPoolExecutor(max_workers=len(roles_to_test)) as executor:
+            futures = [
+                executor.submit(self._run_captured, partial(self._role_flow, role, name))
+                for role, name in roles_to_test
+            ]
+            for future in futures:
+                _write(future.result())
+
+    def _role_flow(self, role, name):
+        """Register a user with the given role, change its password and log in with the new one"""
+        try:
+            print_info(f"Testing password change for role: {role}")
+            
+            original_password = f"{role}Password123!"
+            new_password = f"{role}NewPassword456!"
+            email = f"{role}.password.test@test.com"
+            
+            # Register user with specific role
+            token, user_id = self.register_test_user(
+                email,
+                original_password,
+                name,
+                role
+            )
+            
+            if not token:
+                print_warning(f"Failed to create {role} user - skipping")
+                return
+            
+            headers = {"Authorization": f"Bearer {token}"}
+            
+            # Attempt password change
+            change_response = self.session.post(
+                f"{BACKEND_URL}/auth/change-password",
+                json={
+                    "current_password": original_password,
+                    "new_password": new_password
+                },
+                headers=headers
+            )
+            
+            if change_response.status_code == 200:
+                print_success(f"Password change successful for {role}")
+                self._record(passed=1)
                 
-                # Attempt password change
-                change_response = self.session.post(
-                    f"{BACKEND_URL}/auth/change-password",
-                    json={
-                        "current_password": original_password,
-                        "new_password": new_password
-                    },
-                    headers=headers
-                )
+                # Verify new password works
+                login_response = self.session.post(f"{BACKEND_URL}/auth/login", json={
+                    "email": email,
+                    "password": new_password
+                })
                 
-                if change_response.status_code == 200:
-                    print_success(f"Password change successful for {role}")
-                    self.test_results['passed'] += 1
-                    
-                    # Verify new password works
-                    login_response = self.session.post(f"{BACKEND_URL}/auth/login", json={
-                        "email": email,
-                        "password": new_password
-                    })
-                    
-                    if login_response.status_code == 200:
-                        print_success(f"New password login successful for {role}")
-                        self.test_results['passed'] += 1
-                    else:
-                        print_error(f"New password login failed for {role}")
-                        self.test_results['failed'] += 1
+                if login_response.status_code == 200:
+                    print_success(f"New password login successful for {role}")
+                    self._record(passed=1)
                 else:
-                    print_error(f"Password change failed for {role}: {change_response.status_code}")
-                    self.test_results['failed'] += 1
-                    self.test_results['errors'].append(f"Password change failed for {role}: {change_response.status_code}")
-                
-            except Exception as e:
-                print_error(f"Exception testing {role}: {str(e)}")
-                self.test_results['failed'] += 1
-                self.test_results['errors'].append(f"Role {role} test exception: {str(e)}")
+                    print_error(f"New password login failed for {role}")
+                    self._record(failed=1)
+            else:
+                print_error(f"Password change failed for {role}: {change_response.status_code}")
+                self._record(failed=1, error=f"Password change failed for {role}: {change_response.status_code}")
+            
+        except Exception as e:
+            print_error(f"Exception testing {role}: {str(e)}")
+            self._record(failed=1, error=f"Role {role} test exception: {str(e)}")
 
     def test_security_validations(self):
         """Test 6: Security Validations"""
@@ -487,7 +538,7 @@ class PasswordChangeTester:
         
         if not token:
             print_error("Failed to create test user - skipping security validation tests")
-            self.test_results['failed'] += 1
+            self._record(failed=1)
             return
         
         headers = {"Authorization": f"Bearer {token}"}
@@ -509,41 +560,32 @@ class PasswordChangeTester:
             if change_response.status_code == 200:
                 print_success("Password change successful")
                 
-                # Verify the password is actually changed by trying old password
-                old_login = self.session.post(f"{BACKEND_URL}/auth/login", json={
-                    "email": "security.test.user@test.com",
-                    "password": original_password
-                })
+                old_login, new_login = self._login_old_and_new(
+                    "security.test.user@test.com", original_password, new_password
+                )
                 
+                # Verify the password is actually changed by trying old password
                 if old_login.status_code != 200:
                     print_success("Old password properly invalidated")
-                    self.test_results['passed'] += 1
+                    self._record(passed=1)
                 else:
                     print_error("SECURITY ISSUE: Old password still works!")
-                    self.test_results['failed'] += 1
-                    self.test_results['errors'].append("Old password still works - security breach")
+                    self._record(failed=1, error="Old password still works - security breach")
                 
                 # Verify new password works
-                new_login = self.session.post(f"{BACKEND_URL}/auth/login", json={
-                    "email": "security.test.user@test.com",
-                    "password": new_password
-                })
-                
                 if new_login.status_code == 200:
                     print_success("New password properly hashed and stored")
-                    self.test_results['passed'] += 1
+                    self._record(passed=1)
                 else:
                     print_error("New password not working - hashing issue")
-                    self.test_results['failed'] += 1
-                    self.test_results['errors'].append("New password not working after change")
+                    self._record(failed=1, error="New password not working after change")
             else:
                 print_error(f"Password change failed: {change_response.status_code}")
-                self.test_results['failed'] += 1
+                self._record(failed=1)
             
         except Exception as e:
             print_error(f"Exception in security validation test: {str(e)}")
-            self.test_results['failed'] += 1
-            self.test_results['errors'].append(f"Security validation exception: {str(e)}")
+            self._record(failed=1, error=f"Security validation exception: {str(e)}")
 
     def run_all_tests(self):
         """Run all password change tests"""
@@ -551,13 +593,19 @@ class PasswordChangeTester:
         print_info("Testing POST /api/auth/change-password endpoint")
         print_info("Verifying security, validation, and functionality")
         
-        # Run all test methods
-        self.test_valid_password_change()
-        self.test_incorrect_current_password()
-        self.test_new_password_validation()
-        self.test_authentication_required()
-        self.test_user_roles_access()
-        self.test_security_validations()
+        # Each test uses its own test user, so they can all run at once
+        tests = [
+            self.test_valid_password_change,
+            self.test_incorrect_current_password,
+            self.test_new_password_validation,
+            self.test_authentication_required,
+            self.test_user_roles_access,
+            self.test_security_validations
+        ]
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(self._run_captured, test) for test in tests]
+            for future in futures:
+                sys.stdout.write(future.result())
         
         # Print summary
         self.print_test_summary()
@@ -1,7 +1,11 @@
 import bcrypt
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 import asyncio
+import csv
+import json
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv('/app/backend/.env')
@@ -9,31 +13,69 @@ load_dotenv('/app/backend/.env')
 MONGO_URL = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
 DB_NAME = os.getenv('DB_NAME', 'test_database')
 
-async def reset_password():
-    # Connect to MongoDB
-    client = AsyncIOMotorClient(MONGO_URL)
-    db = client[DB_NAME]
-    
-    # User details
-    email = "spencer.sudbeck@pmagent.net"
-    new_password = "Bizlink25"
+# (email, new password) pairs to reset
+USERS_TO_RESET = [
+    ("spencer.sudbeck@pmagent.net", "Bizlink25"),
+]
+
+def load_users(path):
+    """Read (email, new password) pairs from a .json list of [email, password] pairs or a two-column CSV
+
+    A CSV header row such as "email,password" is skipped (a first row whose email has no "@").
+    Empty files and blank lines yield no users.
+    """
+    with open(path, newline='') as f:
+        if path.endswith('.json'):
+            text = f.read()
+            return [tuple(pair) for pair in json.loads(text)] if text.strip() else []
+        rows = [row for row in csv.reader(f) if any(cell.strip() for cell in row)]
     
-    # Hash the new password
-    password_hash = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    if rows and '@' not in rows[0][0]:
+        rows = rows[1:]
+    return [(row[0].strip(), row[1]) for row in rows]
+
+async def reset_password(users=USERS_TO_RESET):
+    # bulk_write rejects an empty batch, and there is nothing to connect for
+    if not users:
+        print("ℹ️  No users to reset")
+        return
     
-    # Update the user's password
-    result = await db.users.update_one(
-        {"email": email},
-        {"$set": {"password_hash": password_hash}}
-    )
+    # Connect to MongoDB (fail fast instead of waiting 30s if the server is unreachable)
+    client = AsyncIOMotorClient(MONGO_URL, serverSelectionTimeoutMS=5000)
+    db = client[DB_NAME]
     
-    if result.modified_count > 0:
-        print(f"✅ Password successfully reset for {email}")
-        print(f"   New password: {new_password}")
-    else:
-        print(f"❌ User {email} not found or password not updated")
+    # Hash each new password with its own salt; only the database write is batched
+    updates = [
+        UpdateOne(
+            {"email": email},
+            {"$set": {"password_hash": bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')}}
+        )
+        for email, new_password in users
+    ]
     
-    client.close()
+    try:
+        # Update all users' passwords in one round trip
+        result = await db.users.bulk_write(updates, ordered=False)
+        
+        # Fresh salts make every matched hash change, so a short count means missing users
+        if result.modified_count == len(users):
+            for email, new_password in users:
+                print(f"✅ Password successfully reset for {email}")
+                print(f"   New password: {new_password}")
+        else:
+            found = {
+                user['email']
+                async for user in db.users.find({"email": {"$in": [email for email, _ in users]}}, {"_id": 0, "email": 1})
+            }
+            for email, new_password in users:
+                if email in found:
+                    print(f"✅ Password successfully reset for {email}")
+                    print(f"   New password: {new_password}")
+                else:
+                    print(f"❌ User {email} not found or password not updated")
+    finally:
+        client.close()
 
 if __name__ == "__main__":
-    asyncio.run(reset_password())
+    # Optional argument: file of users to reset instead of USERS_TO_RESET
+    asyncio.run(reset_password(load_users(sys.argv[1]) if len(sys.argv) > 1 else USERS_TO_RESET))
@@ -7,9 +7,11 @@ Simulates exactly what the Team View frontend would be doing
 import requests
 import json
 from datetime import datetime, timedelta
+from pytz import timezone as pytz_timezone
 
 # Configuration
 BACKEND_URL = "https://interviewplus.preview.emergentagent.com/api"
+CENTRAL_TZ = pytz_timezone('America/Chicago')
 
 def test_team_view_workflow():
     """Test the exact workflow that Team View frontend uses"""
@@ -101,12 +103,14 @@ def test_team_view_workflow():
         if daily_hierarchy_response.status_code == 200:
             daily_data = daily_hierarchy_response.json()
             daily_stats = daily_data.get('stats', {})
+            daily_contacts = daily_stats.get('contacts', 0)
+            daily_premium = daily_stats.get('premium', 0)
             print(f"✅ Wednesday daily hierarchy:")
-            print(f"   Contacts: {daily_stats.get('contacts', 0)}")
+            print(f"   Contacts: {daily_contacts}")
             print(f"   Appointments: {daily_stats.get('appointments', 0)}")
-            print(f"   Premium: ${daily_stats.get('premium', 0)}")
+            print(f"   Premium: ${daily_premium}")
             
-            if daily_stats.get('contacts', 0) > 0 or daily_stats.get('premium', 0) > 0:
+            if daily_contacts > 0 or daily_premium > 0:
                 print(f"✅ Wednesday has activity data!")
             else:
                 print(f"❌ Wednesday shows zero activity!")
@@ -121,7 +125,12 @@ def test_team_view_workflow():
         activities = my_activities_response.json()
         print(f"✅ Retrieved {len(activities)} total activities")
         
-        wednesday_activities = [a for a in activities if a.get('date') == wednesday_date]
+        # Index activities by date once; Step 5 reuses the same index
+        by_date = {}
+        for a in activities:
+            by_date.setdefault(a.get('date', ''), []).append(a)
+        
+        wednesday_activities = by_date.get(wednesday_date, [])
         print(f"📊 Activities for Wednesday ({wednesday_date}): {len(wednesday_activities)}")
         
         for activity in wednesday_activities:
@@ -138,26 +147,18 @@ def test_team_view_workflow():
     print(f"\n📊 Step 5: Test weekly date range calculation")
     
     # Calculate Monday of current week (same logic as backend)
-    from datetime import datetime, timedelta
-    from pytz import timezone as pytz_timezone
-    
-    central_tz = pytz_timezone('America/Chicago')
-    today = datetime.now(central_tz).date()
+    today = datetime.now(CENTRAL_TZ).date()
     monday = today - timedelta(days=today.weekday())
+    monday_iso = monday.isoformat()
     
     print(f"🗓️ Today (Central Time): {today}")
     print(f"🗓️ Monday of current week: {monday}")
     print(f"🗓️ Wednesday should be: {monday + timedelta(days=2)}")
     
     # Test activities in the date range
-    activities_in_range = []
     if my_activities_response.status_code == 200:
-        activities = my_activities_response.json()
-        for activity in activities:
-            activity_date = activity.get('date', '')
-            if activity_date >= monday.isoformat():
-                activities_in_range.append(activity)
-                
+        activities_in_range = [a for d, lst in by_date.items() if d >= monday_iso for a in lst]
+        
         print(f"📊 Activities in current week range (>= {monday}): {len(activities_in_range)}")
         for activity in activities_in_range:
             print(f"   📋 {activity.get('date')}: Contacts={activity.get('contacts', 0)}, Premium=${activity.get('premium', 0)}")
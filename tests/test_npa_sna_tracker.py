@@ -6,6 +6,9 @@ Test NPA and SNA Tracker endpoints
 import pytest
 import requests
 import os
+from itertools import chain
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
@@ -14,10 +17,30 @@ STATE_MANAGER_EMAIL = "spencer.sudbeck@pmagent.net"
 STATE_MANAGER_PASSWORD = "Bizlink25"
 
 
-@pytest.fixture(scope="module")
-def auth_token():
-    """Get authentication token for state manager"""
-    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+@pytest.fixture(scope="session")
+def http():
+    """Pooled HTTP session shared by every test so calls reuse keep-alive connections"""
+    if not BASE_URL:
+        pytest.skip("REACT_APP_BACKEND_URL is not set")
+    session = requests.Session()
+    # Retry transient failures on idempotent calls only; POST creates agents, so never replay it
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset(["GET", "PUT", "DELETE"])
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def auth_token(http):
+    """Log in once per run and return the state manager's token"""
+    response = http.post(f"{BASE_URL}/api/auth/login", json={
         "email": STATE_MANAGER_EMAIL,
         "password": STATE_MANAGER_PASSWORD
     })
@@ -26,18 +49,74 @@ def auth_token():
     pytest.skip(f"Authentication failed: {response.status_code} - {response.text}")
 
 
-@pytest.fixture(scope="module")
-def auth_headers(auth_token):
-    """Get headers with auth token"""
-    return {"Authorization": f"Bearer {auth_token}"}
+@pytest.fixture(scope="session")
+def authed_http(http, auth_token):
+    """The shared http session carrying the state manager's bearer token"""
+    http.headers["Authorization"] = f"Bearer {auth_token}"
+    return http
+
+
+@pytest.fixture
+def npa_state(authed_http):
+    """NPA tracker payload fetched once at the start of a test"""
+    response = authed_http.get(f"{BASE_URL}/api/npa-tracker")
+    assert response.status_code == 200, f"Failed to get NPA data: {response.text}"
+    return response.json()
+
+
+@pytest.fixture(scope="session")
+def team_members(authed_http):
+    """GET /api/team/all-members once per run, with the agent subset pre-filtered"""
+    response = authed_http.get(f"{BASE_URL}/api/team/all-members")
+    assert response.status_code == 200, f"Failed to get team members: {response.text}"
+    
+    data = response.json()
+    assert isinstance(data, list), "Response should be a list"
+    return {
+        "all": data,
+        "agents": [m for m in data if m.get('role') == 'agent']
+    }
+
+
+def index_agents(data, key="name"):
+    """Map the active and achieved agents of an NPA tracker payload by a field (first entry wins)"""
+    index = {}
+    for agent in chain(data["active"], data["achieved"]):
+        index.setdefault(agent.get(key), agent)
+    return index
+
+
+@pytest.fixture(scope="class")
+def manual_agent(authed_http):
+    """Create TEST_Manual_Agent once for the class; yields the create response and removes the agent afterwards"""
+    test_agent = {
+        "name": "TEST_Manual_Agent",
+        "phone": "555-123-4567",
+        "email": "test_manual@example.com",
+        "start_date": "2025-01-01",
+        "upline_dm": "Test DM",
+        "upline_rm": "Test RM",
+        "total_premium": 500,
+        "notes": "Test agent for NPA tracking",
+        "user_id": ""  # Empty for manual entry
+    }
+    
+    response = authed_http.post(f"{BASE_URL}/api/npa-tracker", json=test_agent)
+    assert response.status_code == 200, f"Failed to add NPA agent: {response.text}"
+    data = response.json()
+    yield data
+    
+    # No-op if test_delete_npa_agent already removed it
+    if "id" in data:
+        authed_http.delete(f"{BASE_URL}/api/npa-tracker/{data['id']}")
 
 
 class TestAuthentication:
     """Test authentication for state manager"""
     
-    def test_login_state_manager(self):
+    def test_login_state_manager(self, http):
         """Test login with state manager credentials"""
-        response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        response = http.post(f"{BASE_URL}/api/auth/login", json={
             "email": STATE_MANAGER_EMAIL,
             "password": STATE_MANAGER_PASSWORD
         })
@@ -52,9 +131,9 @@ class TestAuthentication:
 class TestNPATracker:
     """Test NPA Tracker endpoints - manual agent tracking"""
     
-    def test_get_npa_tracker(self, auth_headers):
+    def test_get_npa_tracker(self, authed_http):
         """Test GET /api/npa-tracker returns proper structure"""
-        response = requests.get(f"{BASE_URL}/api/npa-tracker", headers=auth_headers)
+        response = authed_http.get(f"{BASE_URL}/api/npa-tracker")
         assert response.status_code == 200, f"Failed to get NPA data: {response.text}"
         
         data = response.json()
@@ -65,38 +144,16 @@ class TestNPATracker:
         
         print(f"✓ NPA Tracker: {len(data['active'])} active, {len(data['achieved'])} achieved")
     
-    def test_add_npa_agent_manual(self, auth_headers):
+    def test_add_npa_agent_manual(self, manual_agent):
         """Test adding an agent manually to NPA tracking"""
-        test_agent = {
-            "name": "TEST_Manual_Agent",
-            "phone": "555-123-4567",
-            "email": "test_manual@example.com",
-            "start_date": "2025-01-01",
-            "upline_dm": "Test DM",
-            "upline_rm": "Test RM",
-            "total_premium": 500,
-            "notes": "Test agent for NPA tracking",
-            "user_id": ""  # Empty for manual entry
-        }
+        assert "id" in manual_agent, "Response should have agent ID"
+        assert "message" in manual_agent
         
-        response = requests.post(f"{BASE_URL}/api/npa-tracker", json=test_agent, headers=auth_headers)
-        assert response.status_code == 200, f"Failed to add NPA agent: {response.text}"
-        
-        data = response.json()
-        assert "id" in data, "Response should have agent ID"
-        assert "message" in data
-        
-        print(f"✓ Added manual NPA agent: {data['message']}")
-        return data["id"]
+        print(f"✓ Added manual NPA agent: {manual_agent['message']}")
     
-    def test_verify_manual_agent_in_list(self, auth_headers):
+    def test_verify_manual_agent_in_list(self, manual_agent, npa_state):
         """Verify the manually added agent appears in NPA list"""
-        response = requests.get(f"{BASE_URL}/api/npa-tracker", headers=auth_headers)
-        assert response.status_code == 200
-        
-        data = response.json()
-        all_agents = data["active"] + data["achieved"]
-        test_agent = next((a for a in all_agents if a["name"] == "TEST_Manual_Agent"), None)
+        test_agent = index_agents(npa_state, "id").get(manual_agent["id"])
         
         assert test_agent is not None, "Test agent should be in NPA list"
         assert test_agent["total_premium"] == 500, "Premium should be 500"
@@ -105,34 +162,24 @@ class TestNPATracker:
         
         print(f"✓ Manual agent verified: {test_agent['name']} at {test_agent['progress_percent']}%")
     
-    def test_update_npa_agent(self, auth_headers):
+    def test_update_npa_agent(self, authed_http, manual_agent):
         """Test updating an NPA agent's premium"""
-        # First get the test agent
-        response = requests.get(f"{BASE_URL}/api/npa-tracker", headers=auth_headers)
-        data = response.json()
-        all_agents = data["active"] + data["achieved"]
-        test_agent = next((a for a in all_agents if a["name"] == "TEST_Manual_Agent"), None)
-        
-        if not test_agent:
-            pytest.skip("Test agent not found")
-        
         # Update premium to achieve NPA status
         update_data = {
             "total_premium": 1200,
             "notes": "Updated to achieve NPA"
         }
         
-        response = requests.put(
-            f"{BASE_URL}/api/npa-tracker/{test_agent['id']}", 
-            json=update_data, 
-            headers=auth_headers
+        response = authed_http.put(
+            f"{BASE_URL}/api/npa-tracker/{manual_agent['id']}",
+            json=update_data
         )
         assert response.status_code == 200, f"Failed to update agent: {response.text}"
         
         # Verify agent moved to achieved
-        response = requests.get(f"{BASE_URL}/api/npa-tracker", headers=auth_headers)
+        response = authed_http.get(f"{BASE_URL}/api/npa-tracker")
         data = response.json()
-        achieved_agent = next((a for a in data["achieved"] if a["name"] == "TEST_Manual_Agent"), None)
+        achieved_agent = next((a for a in data["achieved"] if a["id"] == manual_agent["id"]), None)
         
         assert achieved_agent is not None, "Agent should be in achieved list after reaching goal"
         assert achieved_agent["total_premium"] == 1200
@@ -140,39 +187,25 @@ class TestNPATracker:
         
         print(f"✓ Agent updated and achieved NPA status")
     
-    def test_delete_npa_agent(self, auth_headers):
+    def test_delete_npa_agent(self, authed_http, manual_agent):
         """Test deleting an NPA agent"""
-        # Get the test agent
-        response = requests.get(f"{BASE_URL}/api/npa-tracker", headers=auth_headers)
-        data = response.json()
-        all_agents = data["active"] + data["achieved"]
-        test_agent = next((a for a in all_agents if a["name"] == "TEST_Manual_Agent"), None)
-        
-        if not test_agent:
-            pytest.skip("Test agent not found")
-        
-        response = requests.delete(
-            f"{BASE_URL}/api/npa-tracker/{test_agent['id']}", 
-            headers=auth_headers
+        response = authed_http.delete(
+            f"{BASE_URL}/api/npa-tracker/{manual_agent['id']}"
         )
         assert response.status_code == 200, f"Failed to delete agent: {response.text}"
         
-        # Verify agent is removed
-        response = requests.get(f"{BASE_URL}/api/npa-tracker", headers=auth_headers)
-        data = response.json()
-        all_agents = data["active"] + data["achieved"]
-        test_agent = next((a for a in all_agents if a["name"] == "TEST_Manual_Agent"), None)
-        
-        assert test_agent is None, "Test agent should be removed"
+        # Verify agent is removed (state changed, so fetch again)
+        response = authed_http.get(f"{BASE_URL}/api/npa-tracker")
+        assert manual_agent["id"] not in index_agents(response.json(), "id"), "Test agent should be removed"
         print(f"✓ Test agent deleted successfully")
 
 
 class TestSNATracker:
     """Test SNA Tracker endpoints - automatic new agent tracking"""
     
-    def test_get_sna_tracker(self, auth_headers):
+    def test_get_sna_tracker(self, authed_http):
         """Test GET /api/sna-tracker returns proper structure"""
-        response = requests.get(f"{BASE_URL}/api/sna-tracker", headers=auth_headers)
+        response = authed_http.get(f"{BASE_URL}/api/sna-tracker")
         assert response.status_code == 200, f"Failed to get SNA data: {response.text}"
         
         data = response.json()
@@ -191,16 +224,10 @@ class TestSNATracker:
 class TestTeamMembers:
     """Test team members endpoint for NPA dropdown"""
     
-    def test_get_all_team_members(self, auth_headers):
+    def test_get_all_team_members(self, team_members):
         """Test GET /api/team/all-members returns team members"""
-        response = requests.get(f"{BASE_URL}/api/team/all-members", headers=auth_headers)
-        assert response.status_code == 200, f"Failed to get team members: {response.text}"
-        
-        data = response.json()
-        assert isinstance(data, list), "Response should be a list"
-        
-        # Check for agents in the list
-        agents = [m for m in data if m.get('role') == 'agent']
+        data = team_members["all"]
+        agents = team_members["agents"]
         print(f"✓ Team members: {len(data)} total, {len(agents)} agents")
         
         if len(data) > 0:
@@ -214,16 +241,9 @@ class TestTeamMembers:
 class TestNPAWithTeamMember:
     """Test NPA tracker with team member selection (premium from activities)"""
     
-    def test_add_team_member_to_npa(self, auth_headers):
+    def test_add_team_member_to_npa(self, authed_http, team_members, npa_state):
         """Test adding a team member to NPA tracking - premium should come from activities"""
-        # First get team members
-        response = requests.get(f"{BASE_URL}/api/team/all-members", headers=auth_headers)
-        if response.status_code != 200:
-            pytest.skip("Could not get team members")
-        
-        team_members = response.json()
-        agents = [m for m in team_members if m.get('role') == 'agent']
-        
+        agents = team_members["agents"]
         if not agents:
             pytest.skip("No agents found in team")
         
@@ -231,10 +251,7 @@ class TestNPAWithTeamMember:
         test_member = agents[0]
         
         # Check if already tracked
-        response = requests.get(f"{BASE_URL}/api/npa-tracker", headers=auth_headers)
-        npa_data = response.json()
-        all_tracked = npa_data["active"] + npa_data["achieved"]
-        already_tracked = any(a.get("user_id") == test_member["id"] for a in all_tracked)
+        already_tracked = test_member["id"] in index_agents(npa_state, "user_id")
         
         if already_tracked:
             print(f"✓ Agent {test_member['name']} already tracked in NPA")
@@ -253,14 +270,12 @@ class TestNPAWithTeamMember:
             "user_id": test_member["id"]  # Link to team member
         }
         
-        response = requests.post(f"{BASE_URL}/api/npa-tracker", json=npa_agent, headers=auth_headers)
+        response = authed_http.post(f"{BASE_URL}/api/npa-tracker", json=npa_agent)
         assert response.status_code == 200, f"Failed to add team member to NPA: {response.text}"
         
         # Verify the agent's premium is calculated from activities
-        response = requests.get(f"{BASE_URL}/api/npa-tracker", headers=auth_headers)
-        npa_data = response.json()
-        all_agents = npa_data["active"] + npa_data["achieved"]
-        tracked_agent = next((a for a in all_agents if a.get("user_id") == test_member["id"]), None)
+        response = authed_http.get(f"{BASE_URL}/api/npa-tracker")
+        tracked_agent = index_agents(response.json(), "user_id").get(test_member["id"])
         
         assert tracked_agent is not None, "Team member should be in NPA list"
         print(f"✓ Team member {tracked_agent['name']} added to NPA tracking")
@@ -268,9 +283,8 @@ class TestNPAWithTeamMember:
         print(f"  Progress: {tracked_agent['progress_percent']}%")
         
         # Clean up - delete the test entry
-        response = requests.delete(
-            f"{BASE_URL}/api/npa-tracker/{tracked_agent['id']}", 
-            headers=auth_headers
+        response = authed_http.delete(
+            f"{BASE_URL}/api/npa-tracker/{tracked_agent['id']}"
         )
         print(f"✓ Cleaned up test entry")
 
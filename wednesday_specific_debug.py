@@ -12,9 +12,12 @@ This script will:
 
 import requests
 import json
+import os
 from datetime import datetime, timedelta
 import sys
-from pytz import timezone as pytz_timezone
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 BACKEND_URL = "https://interviewplus.preview.emergentagent.com/api"
@@ -27,27 +30,45 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Plain output when piped to a log or when NO_COLOR is set
+if os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+    Colors.GREEN = Colors.RED = Colors.YELLOW = Colors.BLUE = Colors.ENDC = Colors.BOLD = ''
+
+# Prebuilt color prefixes/suffix so each helper is a single write
+_SUCCESS_PFX = f"{Colors.GREEN}✅ "
+_ERROR_PFX = f"{Colors.RED}❌ "
+_WARNING_PFX = f"{Colors.YELLOW}⚠️  "
+_INFO_PFX = f"{Colors.BLUE}ℹ️  "
+_HEADER_PFX = f"{Colors.BOLD}{Colors.BLUE}"
+_HEADER_RULE = f"{_HEADER_PFX}{'='*80}{Colors.ENDC}\n"
+_RESET = f"{Colors.ENDC}\n"
+
 def print_success(message):
-    print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
+    sys.stdout.write(_SUCCESS_PFX + str(message) + _RESET)
 
 def print_error(message):
-    print(f"{Colors.RED}❌ {message}{Colors.ENDC}")
+    sys.stdout.write(_ERROR_PFX + str(message) + _RESET)
 
 def print_warning(message):
-    print(f"{Colors.YELLOW}⚠️  {message}{Colors.ENDC}")
+    sys.stdout.write(_WARNING_PFX + str(message) + _RESET)
 
 def print_info(message):
-    print(f"{Colors.BLUE}ℹ️  {message}{Colors.ENDC}")
+    sys.stdout.write(_INFO_PFX + str(message) + _RESET)
 
 def print_header(message):
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{message}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.ENDC}")
+    sys.stdout.write("\n" + _HEADER_RULE + _HEADER_PFX + str(message) + _RESET + _HEADER_RULE)
 
 class WednesdayDebugger:
     def __init__(self):
         self.session = requests.Session()
+        # Room for the concurrent daily-report fan-out, plus retries on gateway errors
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        ))
         self.token = None
+        self._week_dates = None  # /team/week-dates payload from step 1, reused in step 5
         self.wednesday_signature = {
             "contacts": 99.0,  # Unique signature to identify our test
             "appointments": 77.0,
@@ -66,6 +87,7 @@ class WednesdayDebugger:
             if response.status_code == 200:
                 data = response.json()
                 self.token = data['token']
+                self.session.headers["Authorization"] = f"Bearer {self.token}"
                 print_success(f"Authenticated as: {data['user']['name']}")
                 return True
             else:
@@ -79,14 +101,13 @@ class WednesdayDebugger:
         """Get Wednesday's date according to the system"""
         print_header("STEP 1: GET WEDNESDAY DATE FROM SYSTEM")
         
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         try:
-            response = self.session.get(f"{BACKEND_URL}/team/week-dates", headers=headers)
+            response = self.session.get(f"{BACKEND_URL}/team/week-dates")
             
             if response.status_code == 200:
                 data = response.json()
                 week_dates = data.get('week_dates', [])
+                self._week_dates = week_dates
                 
                 for date_info in week_dates:
                     if date_info.get('day_name') == 'Wednesday':
@@ -112,8 +133,6 @@ class WednesdayDebugger:
         """Create distinctive Wednesday activity"""
         print_header("STEP 2: CREATE DISTINCTIVE WEDNESDAY ACTIVITY")
         
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         activity_data = {
             "date": wednesday_date,
             **self.wednesday_signature,
@@ -132,8 +151,7 @@ class WednesdayDebugger:
         try:
             response = self.session.put(
                 f"{BACKEND_URL}/activities/{wednesday_date}",
-                json=activity_data,
-                headers=headers
+                json=activity_data
             )
             
             if response.status_code == 200:
@@ -151,10 +169,12 @@ class WednesdayDebugger:
         """Verify the activity was stored correctly"""
         print_header("STEP 3: VERIFY ACTIVITY STORAGE")
         
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         try:
-            response = self.session.get(f"{BACKEND_URL}/activities/my", headers=headers)
+            # PUT /activities/{date} only returns a message, so read back just that date
+            response = self.session.get(
+                f"{BACKEND_URL}/activities/my",
+                params={"date": wednesday_date}
+            )
             
             if response.status_code == 200:
                 activities = response.json()
@@ -198,11 +218,9 @@ class WednesdayDebugger:
         """Check where Wednesday activity appears in weekly breakdown"""
         print_header("STEP 4: CHECK WEEKLY BREAKDOWN PLACEMENT")
         
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         try:
             # Get the weekly breakdown
-            response = self.session.get(f"{BACKEND_URL}/team/hierarchy/weekly", headers=headers)
+            response = self.session.get(f"{BACKEND_URL}/team/hierarchy/weekly")
             
             if response.status_code == 200:
                 weekly_data = response.json()
@@ -235,55 +253,59 @@ class WednesdayDebugger:
         """Check daily breakdown for each day of the week to see where Wednesday activity appears"""
         print_header("STEP 5: CHECK DAILY BREAKDOWN FOR EACH DAY")
         
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
-        # Get the week dates first
+        # Get the week dates first (already fetched in step 1 on a normal run)
         try:
-            week_response = self.session.get(f"{BACKEND_URL}/team/week-dates", headers=headers)
-            if week_response.status_code != 200:
-                print_error("Could not get week dates")
-                return False
-                
-            week_data = week_response.json()
-            week_dates = week_data.get('week_dates', [])
+            week_dates = self._week_dates
+            if week_dates is None:
+                week_response = self.session.get(f"{BACKEND_URL}/team/week-dates")
+                if week_response.status_code != 200:
+                    print_error("Could not get week dates")
+                    return False
+                    
+                week_dates = week_response.json().get('week_dates', [])
+                self._week_dates = week_dates
             
             print_info("Checking each day of the week for Wednesday activity signature...")
             
             wednesday_found_on = []
+            signature = (self.wednesday_signature['contacts'], self.wednesday_signature['premium'])
             
-            for date_info in week_dates:
+            # The per-day reports are independent: fetch them all at once, check in order
+            with ThreadPoolExecutor(max_workers=7) as executor:
+                daily_futures = [
+                    executor.submit(
+                        self.session.get,
+                        f"{BACKEND_URL}/reports/daily/individual",
+                        params={"date": date_info.get('date')}
+                    )
+                    for date_info in week_dates
+                ]
+            
+            for date_info, daily_future in zip(week_dates, daily_futures):
                 day_name = date_info.get('day_name')
                 date_str = date_info.get('date')
                 
                 print_info(f"\nChecking {day_name} ({date_str})...")
                 
-                # Get daily report for this date
-                daily_response = self.session.get(
-                    f"{BACKEND_URL}/reports/daily/individual",
-                    params={"date": date_str},
-                    headers=headers
-                )
+                daily_response = daily_future.result()
                 
                 if daily_response.status_code == 200:
                     daily_data = daily_response.json()
                     data_array = daily_data.get('data', [])
                     
-                    # Look for our Wednesday signature
-                    found_signature = False
-                    for member in data_array:
-                        contacts = member.get('contacts', 0)
-                        premium = member.get('premium', 0)
-                        
-                        if (contacts == self.wednesday_signature['contacts'] and 
-                            premium == self.wednesday_signature['premium']):
-                            found_signature = True
-                            print_success(f"  ✅ FOUND Wednesday signature on {day_name}!")
-                            print_info(f"     Member: {member.get('name', 'Unknown')}")
-                            print_info(f"     Contacts: {contacts}, Premium: ${premium}")
-                            wednesday_found_on.append(day_name)
-                            break
+                    # Look for our Wednesday signature (first matching member is enough)
+                    member = next(
+                        (m for m in data_array
+                         if (m.get('contacts', 0), m.get('premium', 0)) == signature),
+                        None
+                    )
                     
-                    if not found_signature:
+                    if member is not None:
+                        print_success(f"  ✅ FOUND Wednesday signature on {day_name}!")
+                        print_info(f"     Member: {member.get('name', 'Unknown')}")
+                        print_info(f"     Contacts: {member.get('contacts')}, Premium: ${member.get('premium')}")
+                        wednesday_found_on.append(day_name)
+                    else:
                         print_info(f"  ➖ Wednesday signature NOT found on {day_name}")
                 else:
                     print_warning(f"  ⚠️ Could not get daily report for {day_name}: {daily_response.status_code}")